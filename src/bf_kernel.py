@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Callable
+from functools import cache
+
+
+def relax(
+    distances: array,
+    next_hops: array,
+    distances_to_midways: list[float],
+    first_hops: list[int],
+    midway_rows: list[array],
+    /,
+) -> list[int]:
+    """
+    Bellman-Ford relaxation kernel working on raw routing table arrays.
+
+    Every destination is checked for a shorter path passing through any of the midway nodes
+    in a single sweep, the table is updated in place.
+
+    This is the reference implementation the kernels generated by specialised_relax
+    must behave exactly like, as checked by the tests.
+
+    :param distances: The distances of the table to update.
+    :param next_hops: The next hops of the table to update.
+    :param distances_to_midways: The current distance to each midway node.
+    :param first_hops: The next hop to reach each midway node.
+    :param midway_rows: The distances from each midway node to every destination.
+    :return: The positions of the destinations that were updated.
+    """
+    improved = []
+    midways = list(zip(distances_to_midways, first_hops))
+
+    for destination, midways_to_node in enumerate(zip(*midway_rows)):
+        best_distance = distances[destination]
+        best_hop = -1
+
+        for (distance_to_midway, first_hop), midway_to_node in zip(midways, midways_to_node):
+            # skip if a node would lead to itself
+            # (the algorithm resolves correctly but will display the wrong path)
+            if not midway_to_node:
+                continue
+
+            # compute the new_distance as the sum of start-midway + midway-destination
+            new_distance = distance_to_midway + midway_to_node
+
+            if new_distance < best_distance:
+                best_distance = new_distance
+                best_hop = first_hop
+
+        if best_hop >= 0:
+            distances[destination] = best_distance
+            next_hops[destination] = best_hop
+            improved.append(destination)
+
+    return improved
+
+
+@cache
+def specialised_relax(midways: int, /) -> Callable[..., list[int]]:
+    """
+    Generate a relax kernel specialised for a fixed number of midway nodes.
+
+    The number of midways never changes once the network is built,
+    so the loop over them is unrolled into straight-line code with one local per midway.
+    Kernels are cached, every node of a network shares the same one.
+
+    :param midways: The number of midway nodes the kernel relaxes through.
+    :return: A function with the same signature and behaviour as relax.
+    """
+    lines = [
+        "def relax(distances, next_hops, distances_to_midways, first_hops, midway_rows, /):",
+        f"    ({''.join(f'via_{midway}, ' for midway in range(midways))}) = distances_to_midways",
+        f"    ({''.join(f'hop_{midway}, ' for midway in range(midways))}) = first_hops",
+        "    improved = []",
+        f"    for destination, ({''.join(f'to_{midway}, ' for midway in range(midways))}) in enumerate(zip(*midway_rows)):",
+        "        best_distance = distances[destination]",
+        "        best_hop = -1",
+    ]
+
+    for midway in range(midways):
+        lines += [
+            f"        if to_{midway}:",
+            f"            new_distance = via_{midway} + to_{midway}",
+            "            if new_distance < best_distance:",
+            "                best_distance = new_distance",
+            f"                best_hop = hop_{midway}",
+        ]
+
+    lines += [
+        "        if best_hop >= 0:",
+        "            distances[destination] = best_distance",
+        "            next_hops[destination] = best_hop",
+        "            improved.append(destination)",
+        "    return improved",
+    ]
+
+    namespace = {}
+    exec(compile("\n".join(lines), f"<relax for {midways} midways>", "exec"), namespace)
+    return namespace["relax"]
+
+
+def bellman_ford(positions: list[int], distances: list[array], next_hops: list[array], /) -> None:
+    """
+    Centralised Bellman-Ford over the routing tables of a whole network, updated in place.
+
+    Used to seed every table with the final result before the distributed algorithm runs.
+
+    :param positions: The position in the arrays of each node owning a table.
+    :param distances: The distances of each table.
+    :param next_hops: The next hops of each table.
+    :return: None
+    """
+    kernel = specialised_relax(len(positions))
+
+    for _ in range(len(positions) - 1):
+        improved = False
+
+        for node_distances, node_next_hops in zip(distances, next_hops):
+            if kernel(
+                node_distances,
+                node_next_hops,
+                [node_distances[position] for position in positions],
+                [node_next_hops[position] for position in positions],
+                distances,
+            ):
+                improved = True
+
+        if not improved:
+            break
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from array import array
+
+
+class BufferPool:
+    """
+    A pool of distance buffers that can be reused instead of allocating new ones.
+
+    Attributes:
+        size (int): The number of distances each buffer holds.
+    """
+
+    def __init__(self, count: int, size: int, /) -> None:
+        self.size = size
+        self._free = [array("d", [0.0]) * size for _ in range(count)]
+
+    def acquire(self) -> array:
+        """
+        Take a buffer out of the pool, allocating a new one if none is free.
+
+        :return: A buffer, its content is undefined.
+        """
+        if self._free:
+            return self._free.pop()
+        return array("d", [0.0]) * self.size
+
+    def release(self, buffer: array, /) -> None:
+        """
+        Give a buffer back to the pool.
+
+        :param buffer: The buffer that is no longer in use.
+        :return: None
+        """
+        self._free.append(buffer)
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from queue import Queue
+
+from packet import Packet
+
+
+def dispatch(router: Queue, queues: dict[str, Queue], /) -> None:
+    """
+    Central dispatcher that coalesces the packets of every node.
+
+    Each node puts a single (name, packet) pair on the router every round.
+    Once the packets of the whole round are in, every node receives
+    the packets of all the other nodes at once, as a single list.
+
+    A node that fails puts a (name, None) pair instead:
+    every node then receives None, so that none of them waits for a round that never completes.
+
+    The dispatcher stops when it reads None from the router.
+
+    :param router: The queue every node sends its packets to.
+    :param queues: A dictionary of node names to their queue.
+    :return: None
+    """
+    round_packets: dict[str, Packet] = {}
+
+    while (item := router.get()) is not None:
+        sender, packet = item
+
+        if packet is None:
+            for queue in queues.values():
+                queue.put(None)
+            round_packets = {}
+            continue
+
+        round_packets[sender] = packet
+
+        if len(round_packets) < len(queues):
+            continue
+
+        for destination, queue in queues.items():
+            queue.put([packet for sender, packet in round_packets.items() if sender != destination])
+
+        round_packets = {}
@@ -1,22 +1,81 @@
 from __future__ import annotations
 
-from typing import Generic, TypeVar
+from array import array
+from collections.abc import Iterable
+from math import inf
+from typing import ClassVar
 
-from hop_info import HopInfo
 
+class HopsMap:
+    """
+    Routing table that represents destination nodes
+    and the most convenient hops to reach those destinations.
 
-# Key type
-_KT = TypeVar("_KT", bound=str)
-# Value type
-_VT = TypeVar("_VT", bound=HopInfo)
+    Distances and next hops are stored as a structure of two parallel arrays,
+    addressed through a name index shared by the whole network,
+    so that a table can be swept in one go.
 
+    Attributes:
+        NAME_TO_IDX (dict[str, int]): The position of every node name in the arrays.
+        IDX_TO_NAME (list[str]): The names of every node in the network, by position.
+        distances (array[float]): The current best distance to each node.
+        next_hops (array[int]): The position of the next hop to each node.
 
-class HopsMap(dict, Generic[_KT, _VT]):
+    A node that is not reachable (yet) has an infinite distance and is its own next hop.
     """
-    Thin wrapper around a dictionary that represents destination nodes
-    and the most convenient hops to reach those destinations.
-    """
-    def distance_to(self, node_name: _KT) -> float:
+
+    __slots__ = ("distances", "next_hops")
+
+    NAME_TO_IDX: ClassVar[dict[str, int]] = {}
+    IDX_TO_NAME: ClassVar[list[str]] = []
+
+    def __init__(self, hops: dict[str, tuple[str, float]], /) -> None:
+        self.distances = array("d", [inf]) * len(self.IDX_TO_NAME)
+        self.next_hops = array("i", range(len(self.IDX_TO_NAME)))
+
+        for node_name, (next_hop, distance) in hops.items():
+            self.set_hop(node_name, next_hop, distance)
+
+    def __repr__(self):
+        return (
+            "{"
+            + ", ".join(
+                f"{node_name!r}: → {self.pass_through(node_name)} (cost: {self.distance_to(node_name)})"
+                for node_name in self
+            )
+            + "}"
+        )
+
+    def __iter__(self):
+        return iter(self.IDX_TO_NAME)
+
+    @classmethod
+    def index_names(cls, names: Iterable[str], /) -> None:
+        """
+        Build the network-wide index every routing table is addressed through.
+
+        Has to be called once, before any table is allocated.
+
+        :param names: The names of every node in the network.
+        :return: None
+        """
+        cls.IDX_TO_NAME = list(names)
+        cls.NAME_TO_IDX = {name: position for position, name in enumerate(cls.IDX_TO_NAME)}
+
+    def set_hop(self, node_name: str, next_hop: str, distance: float) -> None:
+        """
+        Set how a node is reached.
+
+        :param node_name: Name of the node to reach.
+        :param next_hop: Name of the node to pass through.
+        :param distance: The distance to reach the node.
+        :return: None
+        """
+        position = self.NAME_TO_IDX[node_name]
+        self.distances[position] = distance
+        self.next_hops[position] = self.NAME_TO_IDX[next_hop]
+
+    def distance_to(self, node_name: str) -> float:
         """
         Forwards the best destination to reach a node.
         Here for the sake of readability and syntactic sugar.
@@ -24,9 +83,9 @@ class HopsMap(dict, Generic[_KT, _VT]):
         :param node_name: Name of the node to compare.
         :return: The current best distance to reach that node.
         """
-        return self[node_name].best_distance
+        return self.distances[self.NAME_TO_IDX[node_name]]
 
-    def pass_through(self, node_name: _KT) -> str:
+    def pass_through(self, node_name: str) -> str:
         """
         Forwards which path is the best to reach a node.
         Here for the sake of readability and syntactic sugar.
@@ -34,4 +93,4 @@ class HopsMap(dict, Generic[_KT, _VT]):
         :param node_name: Name of the node to compare.
         :return: The current best path to reach that node.
         """
-        return self[node_name].next_hop
+        return self.IDX_TO_NAME[self.next_hops[self.NAME_TO_IDX[node_name]]]
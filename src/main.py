@@ -1,47 +1,86 @@
 #!/usr/bin/env python3.10
-from concurrent.futures import ProcessPoolExecutor
-from multiprocessing import Manager
+from concurrent.futures import ThreadPoolExecutor
 from pprint import pprint
+from queue import Queue
+from threading import Thread
 import sys
 
+from bf_kernel import bellman_ford, specialised_relax
+from dispatcher import dispatch
+from hops_map import HopsMap
 from node import Node
 from parse_links import parse_links
 
 
-def main(filename: str = "data.txt") -> int:
+def run_network(filename: str, /, *, warm_start: bool = False) -> dict[str, Node]:
+    """
+    Build the network described by a file and let its nodes agree on their routing tables.
+
+    :param filename: The name of the file to read the links from.
+    :param warm_start: Seed every table with a centralised Bellman-Ford first.
+    :return: Every node of the network, by name, with its final routing table.
+    """
     # starting data
     links = parse_links(filename)
     nodes = Node.from_links(links)
 
-    with Manager() as manager:
-        # Make a shared memory for every process
-        network = manager.dict()
+    if warm_start:
+        # Seed every table with the final result: the nodes only have to agree on it
+        bellman_ford(
+            [HopsMap.NAME_TO_IDX[node.name] for node in nodes],
+            [node.map.distances for node in nodes],
+            [node.map.next_hops for node in nodes],
+        )
+
+    # Every thread shares the same memory, so the network is never copied
+    network = {}
+    router = Queue()
+
+    for node in nodes:
+        # Initialise nodes with their queue and a network reference
+        node.with_queue(Queue()).with_router(router).with_network(network)
+        network[node.name] = node
+
+    if nodes:
+        # Every node relaxes through all the others: generate their kernel once, up front
+        specialised_relax(len(nodes) - 1)
+
+    # A single thread forwards the packets of every round to every node
+    dispatcher = Thread(target=dispatch, args=(router, {name: node.queue for name, node in network.items()}))
+    dispatcher.start()
 
-        with ProcessPoolExecutor(max_workers=4) as executor:
-            # Make an executor that automatically creates processes, starts and joins them
+    try:
+        # Every node must be running at the same time to complete a round,
+        # an empty network still needs one worker for the pool to start
+        with ThreadPoolExecutor(max_workers=max(len(nodes), 1)) as executor:
+            # Run the threads, and re-raise anything that went wrong in them
+            for _ in executor.map(Node.send_packets, network.values()):
+                pass
+    finally:
+        # The dispatcher is not a daemon: it would keep the program alive
+        router.put(None)
+        dispatcher.join()
 
-            for node in nodes:
-                # Initialise nodes with their queue and a network reference
-                node.with_queue(manager.Queue()).with_network(network)
-                network[node.name] = node
+    return network
 
-            for name, node in network.items():
-                # This hack is needed to invoked the __set_attr__ method of the network
-                # and pass in updated nodes with all connections in place
-                network[name] = node.normalised()
 
-            # Run the processes
-            executor.map(Node.send_packets, network.values())
+def main(filename: str = "data.txt", *, warm_start: bool = False) -> int:
+    network = run_network(filename, warm_start=warm_start)
 
-        # Log the final optimised network
-        print("Network:")
-        pprint(dict(network))
+    # Log the final optimised network
+    print("Network:")
+    pprint(network)
 
     return 0
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        raise RuntimeError('This file is to be executed with exactly 2 arguments'
-                           'The executable name and the file')
-    raise SystemExit(main(sys.argv[1]))
+    match sys.argv[1:]:
+        case [filename]:
+            raise SystemExit(main(filename))
+        case ["--warm-start", filename]:
+            raise SystemExit(main(filename, warm_start=True))
+        case _:
+            raise RuntimeError('This file is to be executed with exactly 2 arguments'
+                               'The executable name and the file'
+                               ' (optionally preceded by --warm-start)')
@@ -1,60 +1,71 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from queue import Queue
 from time import time_ns
-from math import inf
+import logging
 
-from hop_info import HopInfo
+from bf_kernel import specialised_relax
+from buffer_pool import BufferPool
 from hops_map import HopsMap
 from packet import Packet
 
 
-@dataclass(slots=True, eq=True)
+# Whether packets carry a diagnostic header
+DEBUG = False
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True, eq=False)
 class Node:
     """
     A node struct for the graph.
+    Nodes are compared by identity, as every node of a network is unique.
 
     Attributes:
         name (str): The name of the node.
-        hops_map (dict[str, HopInfo]): A map of hops that represent reachable nodes and how far they are.
+        hops_map (HopsMap): A map of hops that represent reachable nodes and how far they are.
         queue (Queue): A Queue object simulating data being sent to the node.
+        router (Queue): A Queue shared by every node, through which packets are dispatched.
         network (list[Node]): A reference to a shared list of all the nodes in the network.
+        edited (bool): Whether the routing table changed during the last round.
     """
 
     name: str
     map: HopsMap = field(hash=False)
     queue: Queue = field(init=False)
+    router: Queue = field(init=False)
     network: dict[str, Node] = field(init=False)
+    edited: bool = field(default=True, init=False)
 
     def __repr__(self):
         return f"<Router {self.name}>" f"\nRouting table:\n{self.map}"
 
     @classmethod
-    def from_links(cls, links: dict[str, list[HopInfo]], /) -> list[Node]:
+    def from_links(cls, links: dict[str, list[tuple[str, float]]], /) -> list[Node]:
         """
         Class constructor that builds a list of Nodes from a dictionary.
 
         The dictionary parameter should be of the form:
 
         {
-            node_1: [hop_info, hop_info ...],
+            node_1: [(next_hop, distance), (next_hop, distance) ...],
 
-            node_2: [hop_info, hop_info ...],
+            node_2: [(next_hop, distance), (next_hop, distance) ...],
 
             ...
         }
 
-        :param links: A Dictionary of node_names to their Hop Information.
+        :param links: A Dictionary of node_names to their hops.
         :return: A List of Nodes.
         """
         nodes = []
 
         for name, hops in links.items():
-            node = cls(
-                name,
-                HopsMap({hop.next_hop: _hop_from(hop.next_hop, hops) for hop in hops}),
-            )
+            # index the hops by name, iterating backwards so the first hop to a node wins
+            hops_by_name = {hop[0]: hop for hop in reversed(hops)}
+            node = cls(name, HopsMap(hops_by_name))
             nodes.append(node)
 
         return nodes
@@ -69,38 +80,24 @@ class Node:
         self.queue = queue
         return self
 
-    def with_network(self, network: dict[str, Node]) -> Node:
+    def with_router(self, router: Queue) -> Node:
         """
-        Set the network of the node.
+        Set the router of the node.
 
-        :param network: The network to set.
-        :return: The node with the network set.
+        :param router: The router to set.
+        :return: The node with the router set.
         """
-        self.network = network
+        self.router = router
         return self
 
-    def normalised(self) -> Node:
-        """
-        Extends the internal hop_map for nodes which are not directly linked.
-
-        A non-linked node is assigned a distance of infinity.
-
-        :return: The object itself.
-        """
-        for node in self.neighbours:
-            if node.name not in self.map:
-                self.map[node.name] = HopInfo(node.name, inf)
-        return self
-
-    def and_send(self, destination: Node, /, *, packet: Packet) -> Node:
+    def with_network(self, network: dict[str, Node]) -> Node:
         """
-        Send a packet to a destination node.
+        Set the network of the node.
 
-        :param destination: The node to and_send the packet to.
-        :param packet: The packet to and_send.
-        :return: The object itself.
+        :param network: The network to set.
+        :return: The node with the network set.
         """
-        destination.queue.put(packet)
+        self.network = network
         return self
 
     @property
@@ -109,100 +106,122 @@ class Node:
         Generate a sample string to use as a dummy dummy_packet.
 
         :return: A string to use as a dummy dummy_packet.
-        Contains time of creation and the name of the node.
+        Contains time of creation and the name of the node when DEBUG is set.
         """
-        return Packet(f"Message from: {self.name}.\nTime: {time_ns()}\n", self.map)
+        header = f"Message from: {self.name}.\nTime: {time_ns()}\n" if DEBUG else ""
+        return Packet(header, self.map.distances, sender=self.name, updated=self.edited)
 
-    @property
-    def neighbours(self) -> list[Node]:
+    def wait_for_packets(self) -> bool:
         """
-        Get a list of all neighbours of the node.
+        Simulate the time it takes for packets to be received.
+        The node waits for a packet from each neighbour and updates its table with them.
 
-        :return: A list of all neighbours of the node.
+        :return: Whether any table in the network changed during the last round,
+        False as well if another node failed.
         """
-        return [node for node in self.network.values() if self.name != node.name]
+        # the dispatcher delivers the whole round at once
+        packets = self.queue.get()
 
-    def wait_for_packets(self) -> None:
-        """
-        Simulate the time it takes for packets to be received.
-        The node waits for a packet from each neighbour and keeps on listening.
+        # another node failed, the round will never be completed
+        if packets is None:
+            return False
 
-        :return: None
-        """
-        while not self.queue.empty():
-            packet = self.queue.get()
-            print(f"{self.name} received {packet.header}\n")
-            self.update_table(packet)
+        # every node sees the same set of flags, so they all stop on the same round
+        if not self.edited and not any(packet.updated for packet in packets):
+            return False
+
+        self.edited = False
+        self.update_table_batch(packets)
+        return True
 
     def send_packets(self, packet: Packet | None = None, /) -> None:
         """
         Simulate the transmission of packets.
         The node sends a packet to each neighbour.
 
-        After sending a packet, the node waits for a packet from each neighbour.
-
-        :param packet: The packet to and_send. Defaults internally to a dummy_packet.
-        :return: None
-        """
-        if packet is None:
-            packet = self.dummy_packet
-
-        for neighbour in self.neighbours:
-            self.and_send(neighbour, packet=packet)
-            print(f"{self.name} sent {packet} to {neighbour.name}")
-
-        self.wait_for_packets()
+        After sending a packet, the node waits for a packet from each neighbour,
+        and repeats until the whole network is stable.
+        The algorithm never needs more rounds than the number of links in the longest path.
 
-    def update_table(self, packet: Packet, /) -> None:
-        """
-        Performs a BellmanFord distributed algorithm to update every link.
+        If the node fails, every other node is told to stop before the error is raised.
 
-        :param packet: A Packet object with the relevant information, including the sender's hop table.
+        :param packet: The first packet to and_send. Defaults internally to a dummy_packet.
         :return: None
         """
-        # self has to be aliased in order to trigger
-        # network's __set_attr__ method
-        proxy = self
-        neighbour_table = packet.content
-        edited = False
+        # neighbours read the distances while the table keeps changing, so a copy is sent.
+        # A buffer is in use until the end of the following round: two of them are enough
+        pool = BufferPool(2, len(self.map.distances))
+        previous = None
 
-        for destination in proxy.map:
-            current_distance = proxy.distance_to(destination)
+        try:
+            for _ in range(len(self.network) - 1):
+                packet = packet or self.dummy_packet
+                buffer = pool.acquire()
+                buffer[:] = packet.content
+                self._send_once(replace(packet, content=buffer))
+                packet = None
 
-            for node in neighbour_table:
-                # grab a possible midway point for a shorter distance overall
-                midway = proxy.network[node]
-                distance_to_midway = proxy.distance_to(node)
-                midway_to_node = midway.distance_to(destination)
+                proceed = self.wait_for_packets()
 
-                # compute the new_distance as the sum of start-midway + midway-destination
-                new_distance = distance_to_midway + midway_to_node
+                # every neighbour is done with the previous round by now
+                if previous is not None:
+                    pool.release(previous)
+                previous = buffer
 
-                # skip if a node would lead to itself
-                # (the algorithm resolves correctly but will display the wrong path)
-                if not midway_to_node:
-                    continue
+                if not proceed:
+                    break
+        except Exception:
+            # let every other node stop instead of waiting for this one forever
+            self.router.put((self.name, None))
+            raise
 
-                # if a shorter path to the destination is found, update the network
-                if new_distance < current_distance:
-                    proxy.map[destination] = HopInfo(
-                        self.network[destination].map.pass_through(midway.name),
-                        new_distance,
-                    )
+    def _send_once(self, packet: Packet, /) -> None:
+        """
+        Send a packet to each neighbour, through the router.
 
-                    print(
-                        f"Updated path from {proxy.name} to {destination}\n"
-                        f"New best distance: {proxy.map[destination].best_distance}\n"
-                    )
+        :param packet: The packet to and_send.
+        :return: None
+        """
+        # the dispatcher forwards the packet to every neighbour
+        self.router.put((self.name, packet))
+        logger.debug("%s sent %s to its neighbours", self.name, packet)
 
-                    edited = True
+    def update_table_batch(self, packets: list[Packet], /) -> None:
+        """
+        Performs a BellmanFord distributed algorithm to update every link.
 
-        # reassign self to trigger the network's __set_attr__ method
-        self.network[self.name] = proxy
+        Every packet received during a round is used at once,
+        each sender being a midway point to every destination.
 
-        # repeat the process if a node was updated
-        if edited:
-            self.send_packets()
+        :param packets: The packets received during the round, each including the sender's distances.
+        :return: None
+        """
+        table = self.map
+        midways = [HopsMap.NAME_TO_IDX[packet.sender] for packet in packets]
+
+        if logger.isEnabledFor(logging.DEBUG):
+            for packet in packets:
+                logger.debug("%s received a packet from %s\n%s", self.name, packet.sender, packet.header)
+
+        improved = specialised_relax(len(packets))(
+            table.distances,
+            table.next_hops,
+            [table.distances[midway] for midway in midways],
+            [table.next_hops[midway] for midway in midways],
+            [packet.content for packet in packets],
+        )
+
+        if logger.isEnabledFor(logging.DEBUG):
+            for destination in improved:
+                logger.debug(
+                    "Updated path from %s to %s\nNew best distance: %s\n",
+                    self.name,
+                    HopsMap.IDX_TO_NAME[destination],
+                    table.distances[destination],
+                )
+
+        if improved:
+            self.edited = True
 
     def distance_to(self, node_name: str) -> float:
         """
@@ -213,16 +232,3 @@ class Node:
         """
         return self.map.distance_to(node_name)
 
-
-def _hop_from(_name: str, _hops: list[HopInfo]) -> HopInfo:
-    """
-    Utility function that finds the first hop which is directly connected to a certain node.
-
-    :param _name: the name of the node to compare.
-    :param _hops: a list of hops to iterate through.
-    :return:
-    """
-    for hop in _hops:
-        if hop.next_hop == _name:
-            return hop
-    raise ValueError('The node you are looking for is not in the given list')
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-from hops_map import HopsMap
+from array import array
 
 
 @dataclass
@@ -16,9 +16,13 @@ class Packet:
 
     Attributes:
         header (str): The header of the packet.
-        content (HopsMap): The payload of the packet.
+        content (array[float]): The payload of the packet, the distances from the sender to every node.
         params (list[str]): The parameters of the packet.
+        sender (str): The name of the node that sent the packet.
+        updated (bool): Whether the sender's table changed since its previous packet.
     """
     header: str
-    content: HopsMap
+    content: array
     params: list[str] | None = None
+    sender: str = ""
+    updated: bool = True
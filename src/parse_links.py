@@ -1,33 +1,52 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
 from pprint import pprint
+import mmap
+import os
+import re
+import stat
 
-from hop_info import HopInfo
+from hops_map import HopsMap
 
 
-def parse_links(filename: str, /) -> dict[str, list[HopInfo]]:
+# A node name followed by the rest of its line, where the hops are
+_LINE_RE = re.compile(rb"^[ \t]*(\S+)[ \t]+(\S[^\n]*)", re.MULTILINE)
+# A single (name,distance) hop
+_HOP_RE = re.compile(rb"\(\s*([^,\s]+)\s*,\s*([^)\s]+)\s*\)")
+
+
+def _read_links(data: bytes | mmap.mmap, /) -> Iterator[tuple[str, list[tuple[str, float]]]]:
+    # Any line that doesn't match the pattern is skipped.
+    for name, links in _LINE_RE.findall(data):
+        name = name.decode()
+        yield name, [(name, 0.0)] + [(hop.decode(), float(distance)) for hop, distance in _HOP_RE.findall(links)]
+
+
+def parse_links(filename: str, /) -> dict[str, list[tuple[str, float]]]:
     """
     Utility function that reads from a file and returns a temporary structure.
 
     This structure has to be used in conjunction with the Node.from_links class method.
+    Every node name found is also registered in the network-wide HopsMap index.
 
     :param filename: The name of the file to read from.
-    :return: A dictionary with the key being the name of the node and the value being a list of HopInfo objects.
+    :return: A dictionary with the key being the name of the node and the value being a list of
+    (next_hop, distance) pairs.
     """
     matrices = {}
 
-    with open(filename) as source:
-        for line in source:
-            match line.strip().split(" "):
-                # Pattern matching makes this very intuitive.
-                case name, *links if links:
-                    matrix = [HopInfo(name, 0.0)] + [
-                        HopInfo.parse_str(link) for link in links
-                    ]
-
-                    matrices[name] = matrix
-                # Ignore any line that doesn't match the pattern.
-                case _:
-                    pass
+    with open(filename, "rb") as source:
+        status = os.fstat(source.fileno())
+        if not stat.S_ISREG(status.st_mode):
+            # Pipes and FIFOs cannot be mapped, and report an empty size whatever they hold
+            matrices.update(_read_links(source.read()))
+        elif status.st_size:
+            # An empty file cannot be mapped, and has no links anyway
+            with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                matrices.update(_read_links(data))
+
+    # Now that every name is known, the routing tables can be allocated
+    HopsMap.index_names(dict.fromkeys(hop for hops in matrices.values() for hop, _ in hops))
 
     return matrices
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from array import array
+from math import inf
+import random
+import unittest
+
+from bf_kernel import relax, specialised_relax
+
+
+class SpecialisedRelaxTest(unittest.TestCase):
+    def test_matches_relax(self):
+        rng = random.Random(0)
+        values = [0.0, inf, -2.0, 1.0, 2.5, 7.0]
+
+        for _ in range(3000):
+            midways = rng.randint(0, 8)
+            size = rng.randint(1, 10)
+
+            distances = array("d", (rng.choice(values) for _ in range(size)))
+            next_hops = array("i", range(size))
+            distances_to_midways = [rng.choice(values) for _ in range(midways)]
+            first_hops = [rng.randrange(size) for _ in range(midways)]
+            midway_rows = [array("d", (rng.choice(values) for _ in range(size))) for _ in range(midways)]
+
+            expected_distances, expected_next_hops = distances[:], next_hops[:]
+            expected = relax(expected_distances, expected_next_hops, distances_to_midways, first_hops, midway_rows)
+            improved = specialised_relax(midways)(distances, next_hops, distances_to_midways, first_hops, midway_rows)
+
+            self.assertEqual(improved, expected)
+            self.assertEqual(distances, expected_distances)
+            self.assertEqual(next_hops, expected_next_hops)
+
+    def test_kernels_are_cached(self):
+        self.assertIs(specialised_relax(3), specialised_relax(3))
+
+
+if __name__ == "__main__":
+    unittest.main()
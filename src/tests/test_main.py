@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from math import inf
+from threading import Thread
+from unittest import mock
+import os
+import tempfile
+import unittest
+
+from main import run_network
+from node import Node
+from parse_links import parse_links
+
+GRAPH = "A (B,1) (C,5)\nB (A,1) (C,2) (D,7)\nC (A,5) (B,2) (D,1)\nD (B,7) (C,1) (E,3)\nE (D,3)\n"
+
+
+def shortest_paths(links: dict[str, list[tuple[str, float]]]) -> dict[str, dict[str, float]]:
+    # Floyd-Warshall, as a reference the distributed result must agree with
+    distances = {source: {target: inf for target in links} for source in links}
+    for source, hops in links.items():
+        for target, distance in hops:
+            distances[source][target] = min(distances[source][target], distance)
+
+    for midway in links:
+        for source in links:
+            for target in links:
+                distances[source][target] = min(
+                    distances[source][target], distances[source][midway] + distances[midway][target]
+                )
+
+    return distances
+
+
+class RunNetworkTest(unittest.TestCase):
+    def setUp(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as source:
+            source.write(GRAPH)
+        self.filename = source.name
+        self.addCleanup(os.remove, self.filename)
+
+    def assertShortestPaths(self, network: dict[str, Node]):
+        expected = shortest_paths(parse_links(self.filename))
+
+        self.assertEqual(network.keys(), expected.keys())
+        for name, node in network.items():
+            for target, distance in expected[name].items():
+                with self.subTest(source=name, target=target):
+                    self.assertEqual(node.distance_to(target), distance)
+
+    def test_finds_shortest_paths(self):
+        self.assertShortestPaths(run_network(self.filename))
+
+    def test_warm_start_matches_cold_start(self):
+        cold = {name: list(node.map.distances) for name, node in run_network(self.filename).items()}
+        update_table_batch = Node.update_table_batch
+        changes = []
+
+        def record_changes(node, packets):
+            before = list(node.map.distances)
+            update_table_batch(node, packets)
+            if list(node.map.distances) != before:
+                changes.append(node.name)
+
+        with mock.patch.object(Node, "update_table_batch", autospec=True, side_effect=record_changes):
+            network = run_network(self.filename, warm_start=True)
+
+        self.assertShortestPaths(network)
+        self.assertEqual({name: list(node.map.distances) for name, node in network.items()}, cold)
+        # The seeded tables are final: the nodes only have to agree on them
+        self.assertEqual(changes, [])
+
+    def test_empty_network(self):
+        with open(self.filename, "w"):
+            pass
+
+        with mock.patch("main.specialised_relax") as specialised_relax:
+            self.assertEqual(run_network(self.filename), {})
+        specialised_relax.assert_not_called()
+
+    def test_reraises_when_a_node_fails(self):
+        update_table_batch = Node.update_table_batch
+
+        def fail_on_c(node, packets):
+            if node.name == "C":
+                raise RuntimeError("C failed")
+            update_table_batch(node, packets)
+
+        errors = []
+
+        def run():
+            try:
+                run_network(self.filename)
+            except RuntimeError as error:
+                errors.append(error)
+
+        with mock.patch.object(Node, "update_table_batch", autospec=True, side_effect=fail_on_c):
+            runner = Thread(target=run, daemon=True)
+            runner.start()
+            runner.join(timeout=10)
+
+        self.assertFalse(runner.is_alive(), "the network hung after a node failed")
+        self.assertEqual([str(error) for error in errors], ["C failed"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+
+from hops_map import HopsMap
+from parse_links import parse_links
+
+
+class ParseLinksTest(unittest.TestCase):
+    def parse(self, content: str) -> dict[str, list[tuple[str, float]]]:
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as source:
+            source.write(content)
+        try:
+            return parse_links(source.name)
+        finally:
+            os.remove(source.name)
+
+    def test_parses_every_line(self):
+        links = self.parse("A (B,1) (C,3)\nB (A,1)\nC (A,3)\n")
+
+        self.assertEqual(
+            links,
+            {
+                "A": [("A", 0.0), ("B", 1.0), ("C", 3.0)],
+                "B": [("B", 0.0), ("A", 1.0)],
+                "C": [("C", 0.0), ("A", 3.0)],
+            },
+        )
+        self.assertEqual(HopsMap.IDX_TO_NAME, ["A", "B", "C"])
+
+    def test_parses_adjacent_hops(self):
+        links = self.parse("A (B,1)(C,2)\n")
+
+        self.assertEqual(links["A"], [("A", 0.0), ("B", 1.0), ("C", 2.0)])
+
+    def test_skips_noise_between_hops(self):
+        links = self.parse("A (B,1) x (C,2)\n")
+
+        self.assertEqual(links["A"], [("A", 0.0), ("B", 1.0), ("C", 2.0)])
+
+    def test_tolerates_whitespace_inside_hops(self):
+        links = self.parse("A ( B , 1 )\r\n")
+
+        self.assertEqual(links["A"], [("A", 0.0), ("B", 1.0)])
+
+    def test_ignores_lines_without_links(self):
+        links = self.parse("A\n\n   \nB (A,1)")
+
+        self.assertEqual(links, {"B": [("B", 0.0), ("A", 1.0)]})
+
+    def test_empty_file(self):
+        self.assertEqual(self.parse(""), {})
+
+    def test_parses_a_pipe(self):
+        read_end, write_end = os.pipe()
+        with os.fdopen(write_end, "w") as source:
+            source.write("A (B,1)\nB (A,1)\n")
+        try:
+            links = parse_links(f"/dev/fd/{read_end}")
+        finally:
+            os.close(read_end)
+
+        self.assertEqual(links, {"A": [("A", 0.0), ("B", 1.0)], "B": [("B", 0.0), ("A", 1.0)]})
+
+
+if __name__ == "__main__":
+    unittest.main()